@@ -1,16 +1,91 @@
 #!/usr/bin/env python3
-"""Build professional HTML reports from markdown and convert to PDF via weasyprint."""
+"""Build professional HTML reports from markdown and convert to PDF via weasyprint.
+
+Usage:
+    build.py [build] [--family NAME] [--profile-out DIR] [--strict]
+                                                      convert and render every report
+    build.py list                                     list reports and their current PDFs
+    build.py index-only                               rebuild index.html from existing PDFs
+    build.py check                                    check sources, tools and PDF budgets
+
+markdown and weasyprint are imported only by the commands that need them.
+"""
 
 import os
 import re
+import sys
+import json
+import hashlib
+import time
+import signal
+import zlib
+import argparse
+import threading
+import collections
 import html as html_module
-import markdown
+import shutil
 import subprocess
+import tempfile
+import fcntl
+import contextlib
 
 OUTPUT_DIR = "/Users/henry/Projects/ell-reports"
 
-def get_css():
-    return """
+# Performance budgets checked after every build. BUDGETS applies to each
+# report (override per report with a "budget" key in its definition);
+# TOTAL_BUDGETS applies to the whole run. Use --strict to fail on violations.
+BUDGETS = {
+    "render_seconds": 60,
+    "pdf_mb": 2,
+    "pages": 60,
+    "peak_memory_mb": 1024,
+}
+# TOTAL_BUDGETS sums render time, PDF size and pages across the run and
+# takes the highest peak memory of any single render.
+TOTAL_BUDGETS = {
+    "render_seconds": 300,
+    "pdf_mb": 20,
+    "pages": 300,
+    "peak_memory_mb": 2048,
+}
+
+# Render timeouts scale with HTML size, or with the previous render time
+# recorded in TIMINGS_PATH. They stay under RENDER_TIMEOUT_MAX unless a
+# recorded render needs more, and then only by RENDER_TIMEOUT_SLOW_HEADROOM.
+# The fallback retry gets what is left of the timeout, but at least
+# RENDER_FALLBACK_SHARE of it. A render showing no CPU or output progress
+# for RENDER_STALL_SECONDS is killed early.
+TIMINGS_PATH = os.path.join(OUTPUT_DIR, ".render-timings.json")
+RENDER_TIMEOUT_MIN = 20
+RENDER_TIMEOUT_MAX = 120
+RENDER_SECONDS_PER_KB = 0.5
+RENDER_TIMEOUT_HEADROOM = 3
+RENDER_TIMEOUT_SLOW_HEADROOM = 1.5
+RENDER_FALLBACK_SHARE = 0.25
+RENDER_STALL_SECONDS = 15
+
+BUDGET_LABELS = {
+    "render_seconds": ("render time", "s", ".1f"),
+    "pdf_mb": ("PDF size", " MB", ".1f"),
+    "pages": ("page count", " pages", "d"),
+    "peak_memory_mb": ("peak memory", " MB", ".0f"),
+}
+
+# Render fingerprints (a hash of each report's final HTML) and build locks
+CACHE_DIR = os.path.join(OUTPUT_DIR, ".cache")
+RENDERS_PATH = os.path.join(CACHE_DIR, "renders.json")
+LOCK_DIR = os.path.join(CACHE_DIR, "locks")
+
+# Cheaper stylesheet for retrying renders that failed or timed out: no web
+# font fetch, flat cover, no hyphenation and tables allowed to split.
+FALLBACK_CSS = """
+.cover-page { background: #0f172a; }
+p { text-align: left; hyphens: manual; }
+table { page-break-inside: auto; }
+"""
+
+def get_css(fallback=False):
+    css = """
 @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Merriweather:wght@300;400;700&display=swap');
 
 @page {
@@ -341,9 +416,13 @@ a {
     table { font-size: 8pt; }
 }
 """
+    if fallback:
+        css = re.sub(r"@import url\([^)]*\);\n", "", css) + FALLBACK_CSS
+    return css
 
 def md_to_html_body(md_content):
     """Convert markdown to HTML body, stripping the first H1 (used on cover)."""
+    import markdown
     # Use python-markdown with tables extension
     extensions = ['tables', 'fenced_code', 'toc', 'smarty']
     body = markdown.markdown(md_content, extensions=extensions)
@@ -406,10 +485,10 @@ def strip_first_heading(md_content):
         result.append(line)
     return '\n'.join(result)
 
-def build_html(title, subtitle, org, md_content):
+def build_html(title, subtitle, org, md_content, fallback=False):
     """Build a complete HTML document with cover page, TOC, and content."""
     
-    css = get_css()
+    css = get_css(fallback)
     toc_items = extract_toc_items(md_content)
     
     # Clean the markdown
@@ -464,7 +543,323 @@ def build_html(title, subtitle, org, md_content):
     return doc
 
 
+# Profiling (--profile-out)
+PROFILE_INTERVAL = 0.005
+
+# Hotspot buckets, matched against the outermost frame on each sampled stack
+PROFILE_CATEGORIES = [
+    ("md_to_html_body", lambda name, path: name == "md_to_html_body" or "/markdown/" in path),
+    ("CSS matching", lambda name, path: "/weasyprint/css/" in path or "/cssselect2/" in path),
+    ("layout", lambda name, path: "/weasyprint/layout/" in path or "/weasyprint/formatting_structure/" in path),
+    ("PDF drawing", lambda name, path: "/weasyprint/draw" in path or "/weasyprint/pdf/" in path or "/pydyf" in path),
+    ("HTML parsing", lambda name, path: "/html5lib/" in path or "/tinyhtml5/" in path),
+]
+
+def start_sampler(thread_id, interval=PROFILE_INTERVAL):
+    """Sample the stack of `thread_id` every `interval` seconds in a background thread.
+
+    Returns a `stop()` callable that ends sampling and returns a Counter of
+    stacks, each a root-to-leaf tuple of (function name, file path, line) frames.
+    """
+    stacks = collections.Counter()
+    done = threading.Event()
+
+    def run():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename.replace(os.sep, "/"), code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                stacks[tuple(reversed(stack))] += 1
+
+    sampler = threading.Thread(target=run, name="profile-sampler", daemon=True)
+    sampler.start()
+
+    def stop():
+        done.set()
+        sampler.join()
+        return stacks
+
+    return stop
+
+def write_collapsed(stacks, path):
+    """Write samples in collapsed-stack format (loadable by speedscope and flamegraph.pl)."""
+    lines = []
+    for stack, count in stacks.most_common():
+        frames = [f"{name} ({os.path.basename(filename)}:{line})" for name, filename, line in stack]
+        lines.append(f"{';'.join(frames)} {count}\n")
+    write_atomic(path, "".join(lines))
+
+def summarize_profile(stacks, top=5):
+    """Return ([(category, share)], [(leaf function, share)]) for the sampled stacks."""
+    total = sum(stacks.values()) or 1
+    categories = collections.Counter()
+    leaves = collections.Counter()
+    for stack, count in stacks.items():
+        category = "other"
+        for name, filename, _ in stack:
+            match = next((label for label, test in PROFILE_CATEGORIES if test(name, filename)), None)
+            if match:
+                category = match
+                break
+        categories[category] += count
+        name, filename, line = stack[-1]
+        leaves[f"{name} ({os.path.basename(filename)}:{line})"] += count
+    return (
+        [(label, count / total) for label, count in categories.most_common()],
+        [(label, count / total) for label, count in leaves.most_common(top)],
+    )
+
+def render_pdf_in_process(html_path, pdf_path, timeout=120):
+    """Render with the weasyprint Python API so the work shows up in the profile.
+
+    A SIGALRM watchdog raises subprocess.TimeoutExpired in the main thread
+    after `timeout` seconds. There is no stall detection in-process.
+    """
+    from weasyprint import HTML
+
+    def expire(signum, frame):
+        raise subprocess.TimeoutExpired(["weasyprint", html_path, pdf_path], timeout)
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        HTML(filename=html_path).write_pdf(pdf_path)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+# Rendering and budgets
+PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+PDF_STREAM_RE = re.compile(rb"(?<!end)stream\r?\n")
+
+def maxrss_bytes(maxrss):
+    """ru_maxrss is in kilobytes on Linux and in bytes on macOS."""
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+class RenderStalled(Exception):
+    pass
+
+def child_cpu_seconds(pid):
+    """CPU time used so far by `pid`, or None when it can't be read."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except OSError:
+        pass
+    try:
+        out = subprocess.run(["ps", "-o", "time=", "-p", str(pid)], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+    if not out:
+        return None
+    # [[dd-]hh:]mm:ss[.ss]
+    days, _, clock = out.rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds + int(days or 0) * 86400
+
+def render_timeout(report, html_bytes, timings):
+    """Scale the render timeout by input size, or by the last successful render when known."""
+    previous = timings.get(report["pdf_name"])
+    ceiling = RENDER_TIMEOUT_MAX
+    if previous:
+        estimate = previous["seconds"] * max(1.0, html_bytes / max(previous["html_bytes"], 1))
+        timeout = RENDER_TIMEOUT_HEADROOM * estimate
+        ceiling = max(RENDER_TIMEOUT_MAX, RENDER_TIMEOUT_SLOW_HEADROOM * estimate)
+    else:
+        timeout = RENDER_TIMEOUT_MIN + RENDER_SECONDS_PER_KB * html_bytes / 1024
+    return min(ceiling, max(RENDER_TIMEOUT_MIN, timeout))
+
+def load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def update_json(path, changes):
+    """Merge `changes` into the JSON object at `path` (None deletes a key).
+
+    Re-reads the file under a lock so concurrent builds of other reports
+    keep their entries.
+    """
+    with output_lock(os.path.basename(path)):
+        data = load_json(path)
+        for key, value in changes.items():
+            if value is None:
+                data.pop(key, None)
+            else:
+                data[key] = value
+        write_atomic(path, json.dumps(data, indent=2, sort_keys=True))
+
+# Concurrency-safe output. Every artifact is written to a temp file in its
+# target directory and renamed into place, so readers never see a partial
+# file; builds take a per-artifact lock, so builds of different reports can
+# run at the same time.
+def temp_path(path):
+    """Create an empty temp file next to `path` and return its name."""
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    stem, ext = os.path.splitext(name)
+    fd, tmp = tempfile.mkstemp(prefix=f".{stem}.", suffix=f".tmp{ext}", dir=directory)
+    os.close(fd)
+    return tmp
+
+def write_atomic(path, content):
+    tmp = temp_path(path)
+    try:
+        with open(tmp, "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+@contextlib.contextmanager
+def output_lock(name):
+    """Hold an exclusive lock on `name` (a report or shared file) in OUTPUT_DIR."""
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(os.path.join(LOCK_DIR, name + ".lock"), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print(f"  ⏳ Waiting for another build holding {name}")
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def render_pdf(html_path, pdf_path, timeout=120):
+    """Run the weasyprint CLI and return (returncode, stderr, peak RSS in bytes).
+
+    Uses os.wait4 rather than subprocess.run so the child's own peak memory
+    can be read from its resource usage. Raises RenderStalled if the child
+    uses no CPU and writes no output for RENDER_STALL_SECONDS.
+    """
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        proc = subprocess.Popen(
+            ["weasyprint", html_path, pdf_path],
+            stdout=subprocess.DEVNULL, stderr=stderr, text=True,
+        )
+        started = last_progress = next_check = time.monotonic()
+        progress = None
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            now = time.monotonic()
+            if now >= next_check:
+                next_check = now + 1
+                current = (child_cpu_seconds(proc.pid), os.path.getsize(pdf_path) if os.path.exists(pdf_path) else 0)
+                if current != progress or current[0] is None:
+                    progress, last_progress = current, now
+            error = None
+            if now - started > timeout:
+                error = subprocess.TimeoutExpired(proc.args, timeout)
+            elif now - last_progress > RENDER_STALL_SECONDS:
+                error = RenderStalled(f"no progress for {now - last_progress:.0f}s")
+            if error:
+                proc.kill()
+                os.wait4(proc.pid, 0)
+                proc.returncode = -9
+                raise error
+            time.sleep(0.05)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        stderr.seek(0)
+        return proc.returncode, stderr.read(), maxrss_bytes(usage.ru_maxrss)
+
+def render_with_fallback(report, md_content, html_path, pdf_path, timeout, in_process=False):
+    """Render `html_path`, retrying once with the fallback stylesheet.
+
+    The PDF is rendered to a temp file and only renamed over `pdf_path` on
+    success. Returns (returncode, peak RSS in bytes, whether the fallback
+    was used); returncode is None when the last attempt raised.
+    """
+    peak_rss = None
+    tmp_pdf = temp_path(pdf_path)
+    deadline = time.monotonic() + timeout
+    try:
+        for fallback in (False, True):
+            render_path = html_path
+            attempt_timeout = timeout
+            if fallback:
+                attempt_timeout = max(deadline - time.monotonic(), RENDER_FALLBACK_SHARE * timeout)
+                print(f"  ↻ Retrying with fallback stylesheet ({attempt_timeout:.0f}s timeout)")
+                render_path = temp_path(html_path)
+                write_atomic(render_path, build_html(
+                    title=report["title"],
+                    subtitle=report["subtitle"],
+                    org=report["org"],
+                    md_content=md_content,
+                    fallback=True,
+                ))
+            try:
+                if in_process:
+                    render_pdf_in_process(render_path, tmp_pdf, timeout=attempt_timeout)
+                    returncode, stderr = 0, ""
+                    # RUSAGE_SELF is the peak of the whole run so far, not of
+                    # this render, so in-process renders skip the memory budget
+                    peak_rss = None
+                else:
+                    returncode, stderr, peak_rss = render_pdf(render_path, tmp_pdf, timeout=attempt_timeout)
+                if returncode == 0:
+                    os.chmod(tmp_pdf, 0o644)
+                    os.replace(tmp_pdf, pdf_path)
+                    break
+                print(f"  ❌ PDF failed: {stderr[:200]}")
+            except Exception as e:
+                returncode = None
+                print(f"  ❌ PDF error: {e}")
+            finally:
+                if fallback:
+                    os.remove(render_path)
+    finally:
+        if os.path.exists(tmp_pdf):
+            os.remove(tmp_pdf)
+    return returncode, peak_rss, fallback
+
+def count_pdf_pages(pdf_path):
+    """Count page objects, looking inside compressed object streams too."""
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    pages = len(PDF_PAGE_RE.findall(data))
+    view = memoryview(data)
+    for match in PDF_STREAM_RE.finditer(data):
+        # Only object streams can hold page dictionaries; skip images and content
+        if b"/ObjStm" not in data[data.rfind(b" obj", 0, match.start()):match.start()]:
+            continue
+        try:
+            pages += len(PDF_PAGE_RE.findall(zlib.decompressobj().decompress(view[match.end():])))
+        except zlib.error:
+            pass
+    return pages
+
+def check_budget(metrics, budget):
+    """Return a human-readable line for each metric over its budget."""
+    violations = []
+    for key, limit in budget.items():
+        value = metrics.get(key)
+        if value is None or value <= limit:
+            continue
+        label, unit, spec = BUDGET_LABELS[key]
+        violations.append(f"{label} {value:{spec}}{unit} > {limit}{unit}")
+    return violations
+
+
 # Report definitions
+# Revisions of the same report share a "family"; `build --family NAME`
+# rebuilds only that family and keeps every other PDF as published.
 reports = [
     {
         "md_path": "/Users/henry/clawd/memory/projects/ell/ag-tech-landscape-2026.md",
@@ -509,6 +904,7 @@ reports = [
         "org": "Elm Lake Labs",
         "html_name": "company-rename.html",
         "pdf_name": "company-rename.pdf",
+        "family": "company-rename",
         "description": "300+ domains checked, 10 finalists evaluated — from premium .com acquisitions (Fallow, Tillage, Swath) to free coined alternatives (Culteon, Callivar).",
     },
     {
@@ -522,8 +918,83 @@ reports = [
     },
 ]
 
-def main():
+COMMANDS = ("build", "list", "index-only", "check")
+
+def parse_args(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Plain `build.py [options]` keeps meaning a full build
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["build"] + argv
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="convert and render every report, then rebuild the index")
+    build.add_argument(
+        "--profile-out", metavar="DIR",
+        help="profile conversion and in-process rendering of each report, writing collapsed stacks to DIR",
+    )
+    build.add_argument(
+        "--family", metavar="NAME",
+        help="only rebuild reports in this family; other reports keep their current PDFs",
+    )
+    build.add_argument(
+        "--strict", action="store_true",
+        help="exit non-zero when any report or the whole run exceeds its performance budget",
+    )
+    commands.add_parser("list", help="list reports and their current PDFs")
+    commands.add_parser("index-only", help="rebuild index.html from the PDFs already in OUTPUT_DIR")
+    commands.add_parser("check", help="check markdown sources, weasyprint and existing PDFs against budgets")
+    return parser.parse_args(argv)
+
+def existing_pdf_size(report):
+    pdf_path = os.path.join(OUTPUT_DIR, report["pdf_name"])
+    return os.path.getsize(pdf_path) if os.path.exists(pdf_path) else 0
+
+def list_reports():
+    for report in reports:
+        size = existing_pdf_size(report)
+        status = f"{size/(1024*1024):.1f} MB" if size > 0 else "not built"
+        family = f" family={report['family']}" if report.get("family") else ""
+        print(f"  • {report['pdf_name']:<28} {report['title']} [{report['org']}{family}] ({status})")
+
+def index_only():
+    build_index([(report, existing_pdf_size(report)) for report in reports])
+    print(f"  ✅ Index written: {os.path.join(OUTPUT_DIR, 'index.html')}")
+
+def check():
+    """Check that every report can be built and its current PDF is within budget."""
+    problems = []
+    if shutil.which("weasyprint") is None:
+        problems.append("weasyprint not found on PATH")
+    for report in reports:
+        if not os.path.exists(report["md_path"]):
+            problems.append(f"{report['title']}: missing source {report['md_path']}")
+        pdf_path = os.path.join(OUTPUT_DIR, report["pdf_name"])
+        if not os.path.exists(pdf_path):
+            problems.append(f"{report['title']}: {report['pdf_name']} not built")
+            continue
+        metrics = {
+            "pdf_mb": os.path.getsize(pdf_path) / (1024 * 1024),
+            "pages": count_pdf_pages(pdf_path),
+        }
+        for violation in check_budget(metrics, {**BUDGETS, **report.get("budget", {})}):
+            problems.append(f"{report['title']}: over budget: {violation}")
+    for problem in problems:
+        print(f"  ❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"  ✅ {len(reports)} reports OK")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "list":
+        return list_reports()
+    if args.command == "check":
+        return check()
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if args.command == "index-only":
+        return index_only()
+    if args.profile_out:
+        os.makedirs(args.profile_out, exist_ok=True)
     
     # First, try installing markdown if needed
     try:
@@ -533,48 +1004,111 @@ def main():
         import markdown
     
     results = []
+    profiles = []
+    budget_violations = []
+    totals = {"render_seconds": 0.0, "pdf_mb": 0.0, "pages": 0, "peak_memory_mb": None}
+    timings = load_json(TIMINGS_PATH)
+    skipped = set()
+    
+    if args.family and not any(report.get("family") == args.family for report in reports):
+        families = sorted({report["family"] for report in reports if report.get("family")})
+        sys.exit(f"Unknown report family: {args.family} (known: {', '.join(families)})")
     
     for report in reports:
+        if args.family and report.get("family") != args.family:
+            skipped.add(report["pdf_name"])
+            results.append((report, existing_pdf_size(report)))
+            continue
+        
         print(f"\n{'='*60}")
         print(f"Processing: {report['title']}")
         print(f"{'='*60}")
         
-        # Read markdown
-        with open(report["md_path"], "r") as f:
-            md_content = f.read()
-        
-        # Build HTML
-        html_content = build_html(
-            title=report["title"],
-            subtitle=report["subtitle"],
-            org=report["org"],
-            md_content=md_content,
-        )
-        
-        # Write HTML
-        html_path = os.path.join(OUTPUT_DIR, report["html_name"])
-        with open(html_path, "w") as f:
-            f.write(html_content)
-        print(f"  ✅ HTML written: {html_path}")
+        if args.profile_out:
+            stop_sampler = start_sampler(threading.get_ident())
+        started = time.perf_counter()
         
-        # Convert to PDF
-        pdf_path = os.path.join(OUTPUT_DIR, report["pdf_name"])
-        try:
-            result = subprocess.run(
-                ["weasyprint", html_path, pdf_path],
-                capture_output=True, text=True, timeout=120
+        # Lock this report's outputs; builds of other reports proceed in parallel
+        with output_lock(report["pdf_name"]):
+            # Read markdown
+            with open(report["md_path"], "r") as f:
+                md_content = f.read()
+            
+            # Build HTML
+            html_content = build_html(
+                title=report["title"],
+                subtitle=report["subtitle"],
+                org=report["org"],
+                md_content=md_content,
             )
-            if result.returncode == 0:
+            
+            # Write HTML
+            html_path = os.path.join(OUTPUT_DIR, report["html_name"])
+            write_atomic(html_path, html_content)
+            print(f"  ✅ HTML written: {html_path}")
+            
+            # Convert to PDF, retrying once with the fallback stylesheet
+            pdf_path = os.path.join(OUTPUT_DIR, report["pdf_name"])
+            html_bytes = len(html_content.encode())
+            html_sha = hashlib.sha256(html_content.encode()).hexdigest()
+            timeout = render_timeout(report, html_bytes, timings)
+            # Re-read under the lock: a concurrent build may have just rendered this report
+            rendered = html_sha == load_json(RENDERS_PATH).get(report["pdf_name"]) and os.path.exists(pdf_path) and not args.profile_out
+            render_started = time.perf_counter()
+            if rendered:
+                returncode, peak_rss, fallback = 0, None, False
+            else:
+                returncode, peak_rss, fallback = render_with_fallback(
+                    report, md_content, html_path, pdf_path, timeout, in_process=bool(args.profile_out),
+                )
+            
+            if returncode == 0:
+                render_seconds = time.perf_counter() - render_started
                 size = os.path.getsize(pdf_path)
                 size_mb = size / (1024 * 1024)
-                print(f"  ✅ PDF generated: {pdf_path} ({size_mb:.1f} MB)")
+                if rendered:
+                    print(f"  ♻️  PDF unchanged, reused: {pdf_path} ({size_mb:.1f} MB)")
+                else:
+                    note = ", fallback stylesheet" if fallback else ""
+                    print(f"  ✅ PDF generated: {pdf_path} ({size_mb:.1f} MB{note})")
                 results.append((report, size))
+                if not fallback and not args.profile_out:
+                    update_json(RENDERS_PATH, {report["pdf_name"]: html_sha})
+                    if not rendered:
+                        update_json(TIMINGS_PATH, {report["pdf_name"]: {"seconds": round(render_seconds, 2), "html_bytes": html_bytes}})
+                else:
+                    # The PDF no longer matches the normal render of html_sha
+                    update_json(RENDERS_PATH, {report["pdf_name"]: None})
+                metrics = {
+                    "render_seconds": None if rendered else render_seconds,
+                    "pdf_mb": size_mb,
+                    "pages": count_pdf_pages(pdf_path),
+                    "peak_memory_mb": None if peak_rss is None else peak_rss / (1024 * 1024),
+                }
+                totals["render_seconds"] += metrics["render_seconds"] or 0
+                totals["pdf_mb"] += size_mb
+                totals["pages"] += metrics["pages"]
+                if metrics["peak_memory_mb"] is not None:
+                    totals["peak_memory_mb"] = max(totals["peak_memory_mb"] or 0, metrics["peak_memory_mb"])
+                violations = check_budget(metrics, {**BUDGETS, **report.get("budget", {})})
+                for violation in violations:
+                    print(f"  ⚠️  Over budget: {violation}")
+                    budget_violations.append((report["title"], violation))
             else:
-                print(f"  ❌ PDF failed: {result.stderr[:200]}")
+                update_json(RENDERS_PATH, {report["pdf_name"]: None})
                 results.append((report, 0))
-        except Exception as e:
-            print(f"  ❌ PDF error: {e}")
-            results.append((report, 0))
+        
+        if args.profile_out:
+            stacks = stop_sampler()
+            elapsed = time.perf_counter() - started
+            profile_path = os.path.join(args.profile_out, os.path.splitext(report["pdf_name"])[0] + ".collapsed")
+            write_collapsed(stacks, profile_path)
+            categories, leaves = summarize_profile(stacks)
+            profiles.append((report, elapsed, categories))
+            print(f"  🔥 Profile written: {profile_path} ({sum(stacks.values())} samples, {elapsed:.1f}s)")
+            print("     " + ", ".join(f"{label} {share:.0%}" for label, share in categories))
+            for label, share in leaves:
+                print(f"     {share:6.1%}  {label}")
     
     # Build index page
     print(f"\n{'='*60}")
@@ -585,8 +1119,26 @@ def main():
     
     print("\n🎉 All done!")
     for report, size in results:
-        status = f"({size/(1024*1024):.1f} MB)" if size > 0 else "(FAILED)"
+        if size > 0:
+            status = f"({size/(1024*1024):.1f} MB)"
+        else:
+            status = "(not built)" if report["pdf_name"] in skipped else "(FAILED)"
         print(f"  • {report['title']} {status}")
+    
+    if profiles:
+        print(f"\n🔥 Hotspots (collapsed stacks in {args.profile_out}, open with https://www.speedscope.app):")
+        for report, elapsed, categories in sorted(profiles, key=lambda p: -p[1]):
+            top = ", ".join(f"{label} {share:.0%}" for label, share in categories[:3])
+            print(f"  • {report['title']} {elapsed:.1f}s — {top}")
+    
+    for violation in check_budget(totals, TOTAL_BUDGETS):
+        budget_violations.append(("Total", violation))
+    if budget_violations:
+        print(f"\n⚠️  {len(budget_violations)} budget violation(s):")
+        for title, violation in budget_violations:
+            print(f"  • {title}: {violation}")
+        if args.strict:
+            sys.exit(1)
 
 def build_index(results):
     """Build the GitHub Pages index.html with a professional dark theme."""
@@ -791,8 +1343,8 @@ footer a {{
 </html>"""
     
     index_path = os.path.join(OUTPUT_DIR, "index.html")
-    with open(index_path, "w") as f:
-        f.write(index_html)
+    with output_lock("index.html"):
+        write_atomic(index_path, index_html)
 
 
 if __name__ == "__main__":
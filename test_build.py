@@ -0,0 +1,36 @@
+"""Tests for build.py."""
+
+import os
+
+import pytest
+
+import build
+
+
+def test_count_pdf_pages_reads_compressed_object_streams():
+    pdf_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fjd-dealer-map.pdf")
+    assert build.count_pdf_pages(pdf_path) == 38
+
+
+def test_check_budget_reports_only_metrics_over_limit():
+    budget = {"render_seconds": 60, "pdf_mb": 2, "pages": 60, "peak_memory_mb": 1024}
+    metrics = {"render_seconds": 12.5, "pdf_mb": 3.24, "pages": 61, "peak_memory_mb": None}
+    assert build.check_budget(metrics, budget) == [
+        "PDF size 3.2 MB > 2 MB",
+        "page count 61 pages > 60 pages",
+    ]
+
+
+@pytest.mark.parametrize("html_bytes, timings, expected", [
+    # No history: scaled by size, within [RENDER_TIMEOUT_MIN, RENDER_TIMEOUT_MAX]
+    (0, {}, 20),
+    (80 * 1024, {}, 60),
+    (10 * 1024 * 1024, {}, 120),
+    # History: headroom over the last render, adjusted for growth
+    (50_000, {"r.pdf": {"seconds": 2, "html_bytes": 50_000}}, 20),
+    (50_000, {"r.pdf": {"seconds": 10, "html_bytes": 25_000}}, 60),
+    # A slow recorded render only stretches the ceiling by the slow headroom
+    (50_000, {"r.pdf": {"seconds": 100, "html_bytes": 50_000}}, 150),
+])
+def test_render_timeout(html_bytes, timings, expected):
+    assert build.render_timeout({"pdf_name": "r.pdf"}, html_bytes, timings) == pytest.approx(expected)